@@ -2,59 +2,136 @@
 
 import json
 import sys
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, NamedTuple, Optional
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 BRANCH_COVERAGE_THRESHOLD = 70.0
 
+_COVERAGE_THRESHOLD_DESC = f">= {BRANCH_COVERAGE_THRESHOLD}"
 
-def _as_bool(value: Any) -> Optional[bool]:
-    if value is None:
-        return None
-    if isinstance(value, bool):
-        return value
-    if isinstance(value, str):
-        lowered = value.strip().lower()
-        if lowered in {"true", "yes", "1", "pass", "passed"}:
-            return True
-        if lowered in {"false", "no", "0", "fail", "failed"}:
-            return False
-    return None
+_CRITERION_KEYS = (
+    "tests_passed",
+    "branch_coverage",
+    "type_checks_passed",
+    "critical_issues_count",
+)
 
+# Bit per criterion, in _CRITERION_KEYS order.
+_ALL_MET_MASK = 0b1111
 
-def _as_float(value: Any) -> Optional[float]:
-    if value is None:
-        return None
-    if isinstance(value, (int, float)):
-        return float(value)
-    if isinstance(value, str):
-        try:
-            return float(value.strip())
-        except ValueError:
-            return None
+# Reason strings never vary at runtime (the coverage one only depends on the
+# module-level threshold), so they are built once at import.
+_R_TESTS_OK = "tests passed"
+_R_TESTS_FAIL = "tests_passed must be true"
+_R_COV_OK = "branch coverage above threshold"
+_R_COV_FAIL = f"branch_coverage must be >= {BRANCH_COVERAGE_THRESHOLD}"
+_R_COV_MISSING = "branch_coverage must be provided"
+_R_TYPE_OK = "type checks passed"
+_R_TYPE_FAIL = "type_checks_passed must be true"
+_R_CRIT_OK = "no critical issues"
+_R_CRIT_FAIL = "critical issues must be 0"
+_R_CRIT_MISSING = "critical_issues_count must be provided"
+
+# The thresholds block of the result never varies; build it once instead of
+# re-hashing the dict literal on every evaluate() call.
+_THRESHOLDS = {
+    "branch_coverage": _COVERAGE_THRESHOLD_DESC,
+    "tests_passed": True,
+    "type_checks_passed": True,
+    "critical_issues_count": 0,
+}
+
+
+def _json_dumps(obj: Any) -> bytes:
+    # Match the C encoders' output shape: UTF-8 bytes, no \uXXXX escaping,
+    # no inter-token spacing.
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Bind the codec once at import instead of branching per call; msgspec's
+# Decoder/Encoder objects cache their dispatch state across calls, so a
+# long-running importer of evaluate() reuses them for free.
+if msgspec is not None:
+    _loads = msgspec.json.Decoder().decode
+    _dumps = msgspec.json.Encoder().encode
+elif orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+else:
+    _loads = json.loads
+    _dumps = _json_dumps
+
+
+_TRUE_STRINGS = {"true", "yes", "1", "pass", "passed"}
+_FALSE_STRINGS = {"false", "no", "0", "fail", "failed"}
+
+
+def _bool_from_str(value: str) -> Optional[bool]:
+    lowered = value.strip().lower()
+    if lowered in _TRUE_STRINGS:
+        return True
+    if lowered in _FALSE_STRINGS:
+        return False
     return None
 
 
-def _as_int(value: Any) -> Optional[int]:
-    if value is None:
+def _float_from_str(value: str) -> Optional[float]:
+    try:
+        return float(value.strip())
+    except ValueError:
         return None
-    if isinstance(value, bool):
+
+
+def _int_from_str(value: str) -> Optional[int]:
+    try:
+        return int(value.strip())
+    except ValueError:
         return None
-    if isinstance(value, int):
-        return value
-    if isinstance(value, float) and value.is_integer():
-        return int(value)
-    if isinstance(value, str):
-        try:
-            return int(value.strip())
-        except ValueError:
-            return None
+
+
+def _int_from_float(value: float) -> Optional[int]:
+    return int(value) if value.is_integer() else None
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _none(value: Any) -> None:
     return None
 
 
-@dataclass
-class CriterionResult:
+# Exact-type dispatch tables: one dict lookup replaces the isinstance
+# chains, and keying on type() keeps bool out of the int/float rules
+# without an explicit guard. JSON payloads only carry exact types.
+_BOOL_COERCE = {bool: _identity, str: _bool_from_str}
+_FLOAT_COERCE = {bool: float, int: float, float: _identity, str: _float_from_str}
+_INT_COERCE = {int: _identity, float: _int_from_float, str: _int_from_str}
+
+
+def _as_bool(value: Any) -> Optional[bool]:
+    return _BOOL_COERCE.get(type(value), _none)(value)
+
+
+def _as_float(value: Any) -> Optional[float]:
+    return _FLOAT_COERCE.get(type(value), _none)(value)
+
+
+def _as_int(value: Any) -> Optional[int]:
+    return _INT_COERCE.get(type(value), _none)(value)
+
+
+class CriterionResult(NamedTuple):
     met: bool
     value: Any
     threshold: Any
@@ -67,93 +144,90 @@ def evaluate(payload: Dict[str, Any]) -> Dict[str, Any]:
     branch_coverage = _as_float(payload.get("branch_coverage"))
     critical_issues_count = _as_int(payload.get("critical_issues_count"))
 
+    # Decide all four criteria up front as a bitmask so the summary fields
+    # below derive from cheap integer ops instead of re-testing each result.
+    mask = (
+        (tests_passed is True)
+        | (
+            (
+                branch_coverage is not None
+                and branch_coverage >= BRANCH_COVERAGE_THRESHOLD
+            )
+            << 1
+        )
+        | ((type_checks_passed is True) << 2)
+        | ((critical_issues_count == 0) << 3)
+    )
+
     tests_ok = CriterionResult(
-        met=(tests_passed is True),
+        met=bool(mask & 0b0001),
         value=tests_passed,
         threshold=True,
-        reason=(
-            "tests_passed must be true" if tests_passed is not True else "tests passed"
-        ),
+        reason=(_R_TESTS_OK if mask & 0b0001 else _R_TESTS_FAIL),
     )
 
     coverage_ok = CriterionResult(
-        met=(
-            branch_coverage is not None and branch_coverage >= BRANCH_COVERAGE_THRESHOLD
-        ),
+        met=bool(mask & 0b0010),
         value=branch_coverage,
-        threshold=f">= {BRANCH_COVERAGE_THRESHOLD}",
+        threshold=_COVERAGE_THRESHOLD_DESC,
         reason=(
-            "branch_coverage must be provided"
-            if branch_coverage is None
-            else (
-                f"branch_coverage must be >= {BRANCH_COVERAGE_THRESHOLD}"
-                if branch_coverage < BRANCH_COVERAGE_THRESHOLD
-                else "branch coverage above threshold"
-            )
+            _R_COV_OK
+            if mask & 0b0010
+            else (_R_COV_MISSING if branch_coverage is None else _R_COV_FAIL)
         ),
     )
 
     typecheck_ok = CriterionResult(
-        met=(type_checks_passed is True),
+        met=bool(mask & 0b0100),
         value=type_checks_passed,
         threshold=True,
-        reason=(
-            "type_checks_passed must be true"
-            if type_checks_passed is not True
-            else "type checks passed"
-        ),
+        reason=(_R_TYPE_OK if mask & 0b0100 else _R_TYPE_FAIL),
     )
 
     critical_ok = CriterionResult(
-        met=(critical_issues_count == 0),
+        met=bool(mask & 0b1000),
         value=critical_issues_count,
         threshold=0,
         reason=(
-            "critical_issues_count must be provided"
-            if critical_issues_count is None
-            else (
-                "no critical issues"
-                if critical_issues_count == 0
-                else "critical issues must be 0"
-            )
+            _R_CRIT_OK
+            if mask & 0b1000
+            else (_R_CRIT_MISSING if critical_issues_count is None else _R_CRIT_FAIL)
         ),
     )
 
-    criteria = {
-        "tests_passed": tests_ok,
-        "branch_coverage": coverage_ok,
-        "type_checks_passed": typecheck_ok,
-        "critical_issues_count": critical_ok,
-    }
+    criteria = dict(
+        zip(_CRITERION_KEYS, (tests_ok, coverage_ok, typecheck_ok, critical_ok))
+    )
+
+    all_met = mask == _ALL_MET_MASK
+
+    unmet = (
+        []
+        if all_met
+        else [
+            {
+                "key": key,
+                "reason": result.reason,
+                "value": result.value,
+                "threshold": result.threshold,
+            }
+            for key, result in criteria.items()
+            if not result.met
+        ]
+    )
 
-    unmet = [
-        {
-            "key": key,
-            "reason": result.reason,
-            "value": result.value,
-            "threshold": result.threshold,
-        }
-        for key, result in criteria.items()
-        if not result.met
-    ]
-
-    met_count = sum(1 for r in criteria.values() if r.met)
+    met_count = bin(mask).count("1")
     score = int(round((met_count / 4.0) * 100))
 
-    decision = "approve" if met_count == 4 else "iterate"
+    decision = "approve" if all_met else "iterate"
 
-    summary = "Exit criteria met" if decision == "approve" else "Exit criteria NOT met"
+    summary = "Exit criteria met" if all_met else "Exit criteria NOT met"
 
     return {
         "ok": True,
         "decision": decision,
         "score": score,
-        "thresholds": {
-            "branch_coverage": f">= {BRANCH_COVERAGE_THRESHOLD}",
-            "tests_passed": True,
-            "type_checks_passed": True,
-            "critical_issues_count": 0,
-        },
+        "thresholds": _THRESHOLDS,
         "inputs": {
             "tests_passed": tests_passed,
             "branch_coverage": branch_coverage,
@@ -161,13 +235,30 @@ def evaluate(payload: Dict[str, Any]) -> Dict[str, Any]:
             "critical_issues_count": critical_issues_count,
         },
         "criteria": {
-            key: {
-                "met": result.met,
-                "value": result.value,
-                "threshold": result.threshold,
-                "reason": result.reason,
-            }
-            for key, result in criteria.items()
+            "tests_passed": {
+                "met": tests_ok.met,
+                "value": tests_ok.value,
+                "threshold": tests_ok.threshold,
+                "reason": tests_ok.reason,
+            },
+            "branch_coverage": {
+                "met": coverage_ok.met,
+                "value": coverage_ok.value,
+                "threshold": coverage_ok.threshold,
+                "reason": coverage_ok.reason,
+            },
+            "type_checks_passed": {
+                "met": typecheck_ok.met,
+                "value": typecheck_ok.value,
+                "threshold": typecheck_ok.threshold,
+                "reason": typecheck_ok.reason,
+            },
+            "critical_issues_count": {
+                "met": critical_ok.met,
+                "value": critical_ok.value,
+                "threshold": critical_ok.threshold,
+                "reason": critical_ok.reason,
+            },
         },
         "unmet": unmet,
         "summary": summary,
@@ -176,17 +267,20 @@ def evaluate(payload: Dict[str, Any]) -> Dict[str, Any]:
 
 def main() -> int:
     try:
-        raw = sys.stdin.read()
-        payload = json.loads(raw) if raw.strip() else {}
+        # Read bytes and let the JSON parser decode; both orjson and stdlib
+        # json accept bytes, so the text-mode UTF-8 round trip is skipped.
+        raw = sys.stdin.buffer.read()
+        payload = _loads(raw) if raw and raw.strip() else {}
         if not isinstance(payload, dict):
             raise ValueError("Input payload must be a JSON object")
 
         result = evaluate(payload)
-        sys.stdout.write(json.dumps(result))
-        sys.stdout.write("\n")
+        # writelines batches body and newline into the buffered stream
+        # without concatenating a fresh bytes object first.
+        sys.stdout.buffer.writelines((_dumps(result), b"\n"))
         return 0
     except Exception as exc:
-        sys.stdout.write(json.dumps({"ok": False, "error": str(exc)}) + "\n")
+        sys.stdout.buffer.writelines((_dumps({"ok": False, "error": str(exc)}), b"\n"))
         return 0
 
 
@@ -5,80 +5,160 @@ This script is used by api_diff_reporter.ts to analyze API changes between git r
 """
 
 import ast
+import hashlib
 import json
 import sys
 
 
+# Parse cache for server mode: the same content is often submitted more than
+# once per session (e.g. both sides of a diff touching few symbols), and
+# re-parsing dominates a warm request. FIFO-capped, keyed by content digest.
+_PARSE_CACHE = {}
+_PARSE_CACHE_MAX = 512
+
+
+def _parse_cached(content, filepath):
+    if isinstance(content, str):
+        raw = content.encode("utf-8", "surrogatepass")
+    else:
+        raw = content
+    key = hashlib.blake2b(raw, digest_size=16).digest()
+    tree = _PARSE_CACHE.get(key)
+    if tree is None:
+        tree = ast.parse(content, filepath)
+        if len(_PARSE_CACHE) >= _PARSE_CACHE_MAX:
+            del _PARSE_CACHE[next(iter(_PARSE_CACHE))]
+        _PARSE_CACHE[key] = tree
+    return tree
+
+
+def _symbol_from_class(node):
+    return (node.name, "class", f"class {node.name}")
+
+
+def _symbol_from_func(node):
+    args = [arg.arg for arg in node.args.args]
+    return (node.name, "function", f'def {node.name}({", ".join(args)})')
+
+
+def _symbol_from_async_func(node):
+    args = [arg.arg for arg in node.args.args]
+    return (node.name, "function", f'async def {node.name}({", ".join(args)})')
+
+
+# Exact-type dispatch for top-level defs: one dict lookup instead of an
+# isinstance cascade per statement. Assign stays inline below because it
+# can bind several names and doubles as the __all__ carrier.
+_SYMBOL_HANDLERS = {
+    ast.ClassDef: _symbol_from_class,
+    ast.FunctionDef: _symbol_from_func,
+    ast.AsyncFunctionDef: _symbol_from_async_func,
+}
+
+
 def extract_public_api(content, filepath):
     """Extract all public API symbols from Python content."""
     try:
-        tree = ast.parse(content, filepath)
+        tree = _parse_cached(content, filepath)
     except SyntaxError:
         return []
 
-    symbols = []
     module_name = filepath.replace(".py", "").replace("/", ".")
 
-    # Check for __all__ definition
+    # Single pass over top-level statements: __all__ can only be a module-level
+    # assign, so there is no need to walk function/class bodies for it.
     all_exports = None
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Assign):
-            for target in node.targets:
-                if isinstance(target, ast.Name) and target.id == "__all__":
-                    if isinstance(node.value, (ast.List, ast.Tuple)):
-                        # Handle both ast.Str (Python < 3.8) and ast.Constant (Python >= 3.8)
-                        all_exports = []
-                        for elt in node.value.elts:
-                            if isinstance(elt, ast.Str):
-                                all_exports.append(elt.s)
-                            elif isinstance(elt, ast.Constant) and isinstance(
-                                elt.value, str
-                            ):
-                                all_exports.append(elt.value)
+    pending = []
 
     for node in tree.body:
         name = None
         symbol_type = None
         signature = None
 
-        if isinstance(node, ast.ClassDef):
-            name = node.name
-            symbol_type = "class"
-            signature = f"class {name}"
-        elif isinstance(node, ast.FunctionDef):
-            name = node.name
-            symbol_type = "function"
-            args = [arg.arg for arg in node.args.args]
-            signature = f'def {name}({", ".join(args)})'
-        elif isinstance(node, ast.Assign):
+        handler = _SYMBOL_HANDLERS.get(type(node))
+        if handler is not None:
+            name, symbol_type, signature = handler(node)
+        elif type(node) is ast.Assign:
             for target in node.targets:
                 if isinstance(target, ast.Name):
+                    if target.id == "__all__":
+                        if isinstance(node.value, (ast.List, ast.Tuple)):
+                            # Handle both ast.Str (Python < 3.8) and ast.Constant (Python >= 3.8)
+                            all_exports = []
+                            for elt in node.value.elts:
+                                if isinstance(elt, ast.Str):
+                                    all_exports.append(elt.s)
+                                elif isinstance(elt, ast.Constant) and isinstance(
+                                    elt.value, str
+                                ):
+                                    all_exports.append(elt.value)
+                        continue
                     name = target.id
                     # Distinguish constants (UPPER_CASE) from variables
                     symbol_type = "constant" if name.isupper() else "variable"
 
-        # Only include public symbols (not starting with _) or those in __all__
+        # Only include public symbols (not starting with _)
         if name and not name.startswith("_"):
-            if all_exports is None or name in all_exports:
-                symbols.append(
-                    {
-                        "name": name,
-                        "type": symbol_type,
-                        "signature": signature,
-                        "module": module_name,
-                        "line": node.lineno,
-                    }
-                )
+            pending.append((name, symbol_type, signature, node.lineno))
 
-    return symbols
+    # Apply the __all__ filter after the pass, since __all__ may be assigned
+    # below the symbols it exports.
+    return [
+        {
+            "name": name,
+            "type": symbol_type,
+            "signature": signature,
+            "module": module_name,
+            "line": lineno,
+        }
+        for name, symbol_type, signature, lineno in pending
+        if all_exports is None or name in all_exports
+    ]
+
+
+def run_server():
+    """Serve extraction requests over stdin as JSON lines.
+
+    Each request line is {"filepath": ..., "content": ...} and produces one
+    JSON response line (the symbol list, or {"error": ...}). A driver can
+    keep one process warm and pipe many files through it instead of paying
+    interpreter startup per file.
+    """
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            response = extract_public_api(request["content"], request["filepath"])
+        except Exception as exc:
+            response = {"error": str(exc)}
+        sys.stdout.write(
+            json.dumps(response, ensure_ascii=False, separators=(",", ":")) + "\n"
+        )
+        sys.stdout.flush()
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: extract_api.py <filepath>", file=sys.stderr)
+    argv = sys.argv[1:]
+    if "--server" in argv:
+        run_server()
+        sys.exit(0)
+
+    args = [a for a in argv if not a.startswith("--")]
+    if not args:
+        print(
+            "Usage: extract_api.py <filepath> [--compact] | extract_api.py --server",
+            file=sys.stderr,
+        )
         sys.exit(1)
 
     content = sys.stdin.read()
-    filepath = sys.argv[1]
+    filepath = args[0]
     symbols = extract_public_api(content, filepath)
-    print(json.dumps(symbols, indent=2))
+    if "--compact" in argv:
+        # Machine consumers don't need the pretty-printing pass.
+        out = json.dumps(symbols, ensure_ascii=False, separators=(",", ":"))
+    else:
+        out = json.dumps(symbols, indent=2)
+    # One write for body plus newline instead of print()'s two.
+    sys.stdout.write(out + "\n")